@@ -3,17 +3,70 @@
 import logging
 import os
 import re
+import uuid
+from operator import attrgetter
 
 from models.post import Post
 from models.sentiment import Sentiment
 import awswrangler as wr
+import boto3
+import numpy as np
 import pandas as pd
+from botocore.config import Config
+
+# Reuse one session across warm invocations so credential and service model
+# loading happen once; awswrangler still builds a new client on every call.
+# Not thread-safe, only pass it to calls made from a single thread
+BOTO3_SESSION = boto3.session.Session()
+# Deliberately process-wide: this sets the botocore config for every awswrangler
+# call in the Lambda, not just the ones made from this module
+wr.config.botocore_config = Config(
+    max_pool_connections=32, retries={"max_attempts": 10, "mode": "adaptive"}
+)
+
+# Sentiment table columns and their Athena types, in Sentiment.to_dict() order
+_SENTIMENT_COLUMN_TYPES = {
+    "keyword": "STRING",
+    "created_at": "TIMESTAMP",
+    "execution_id": "STRING",
+    "post_id": "STRING",
+    "post_url": "STRING",
+    "sentiment": "STRING",
+    "sentiment_score_mixed": "DOUBLE",
+    "sentiment_score_positive": "DOUBLE",
+    "sentiment_score_neutral": "DOUBLE",
+    "sentiment_score_negative": "DOUBLE",
+}
+_SENTIMENT_COLUMNS = tuple(_SENTIMENT_COLUMN_TYPES)
+# How each column is read from a Sentiment, so the DataFrame is built column by
+# column without a dict per row
+_SENTIMENT_COLUMN_GETTERS = {
+    "keyword": attrgetter("post.keyword"),
+    "created_at": attrgetter("post.created_at"),
+    "execution_id": attrgetter("post.execution_id"),
+    "post_id": attrgetter("post.id"),
+    "post_url": attrgetter("post.post_url"),
+    "sentiment": attrgetter("sentiment"),
+    "sentiment_score_mixed": attrgetter("mixed"),
+    "sentiment_score_positive": attrgetter("positive"),
+    "sentiment_score_neutral": attrgetter("neutral"),
+    "sentiment_score_negative": attrgetter("negative"),
+}
+
+INVALID_TABLE_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+# Translation table for the common pure-ASCII case, avoids the regex engine entirely
+ASCII_TABLE_NAME_TRANSLATION = str.maketrans(
+    {c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c == "_")}
+)
 
 
 def sanitize_for_athena(name):
     """Sanitize a string for use as an Athena table name."""
     # Replace special characters with underscores
-    sanitized = re.sub(r"[^a-zA-Z0-9_]", "_", name)
+    if name.isascii():
+        sanitized = name.translate(ASCII_TABLE_NAME_TRANSLATION)
+    else:
+        sanitized = INVALID_TABLE_NAME_CHARS.sub("_", name)
 
     # Ensure it starts with a letter or underscore
     if sanitized and sanitized[0].isdigit():
@@ -24,34 +77,56 @@ def sanitize_for_athena(name):
 
 def get_posts(execution_id: str) -> list[Post]:
     """
-    Get posts from Athena
+    Get posts from Athena, deduplicated by post id
     """
     table = "post"
     database = "sentimental"
     bucket = os.environ["S3_BUCKET_NAME"]
+    # Deduplicate on id in the query engine so duplicates are never transferred
     query = f"""
         SELECT id, execution_id, created_at, keyword, source, title, body, comments, post_url
-        FROM {database}.{table}
-        WHERE execution_id = '{execution_id}'
+        FROM (
+            SELECT *, row_number() OVER (PARTITION BY id ORDER BY created_at DESC) AS rn
+            FROM {database}.{table}
+            WHERE execution_id = ?
+        )
+        WHERE rn = 1
     """
     # Execute Athena query and get results as pandas DataFrame
     df: pd.DataFrame = wr.athena.read_sql_query(
         sql=query,
         database=database,
-        s3_output=f"s3://{bucket}/athena-results/",
-        ctas_approach=False,  # must set to False if we have timestamp in filter
+        # Sent as Athena execution parameters, never spliced into the SQL text
+        params=[f"'{execution_id.replace("'", "''")}'"],
+        paramstyle="qmark",
+        # UNLOAD requires an empty output location
+        s3_output=f"s3://{bucket}/athena-results/unload/{uuid.uuid4()}/",
+        # awswrangler rejects ctas_approach and unload_approach together
+        ctas_approach=False,
+        # UNLOAD writes Parquet results that are read back in parallel,
+        # skipping CSV parsing
+        unload_approach=True,
+        unload_parameters={"compression": "snappy"},
+        use_threads=True,
+        keep_files=False,
+        boto3_session=BOTO3_SESSION,
     )
 
     if df.empty:
         return []
 
-    # Convert DataFrame rows to Post objects
-    posts = []
-    for row in df.to_dict(orient="records"):
-        post = Post.from_dict(row)
-        posts.append(post)
+    # Parquet ARRAY<STRING> columns come back as numpy arrays, Post expects lists
+    df["comments"] = [
+        c.tolist() if isinstance(c, np.ndarray) else c for c in df["comments"]
+    ]
 
-    return posts
+    # Convert DataFrame rows to Post objects, iterating plain tuples instead of
+    # materializing an intermediate list of dicts
+    columns = list(df.columns)
+    return [
+        Post.from_dict(dict(zip(columns, row)))
+        for row in df.itertuples(index=False, name=None)
+    ]
 
 
 def save_sentiments(
@@ -69,6 +144,9 @@ def save_sentiments(
         min_created_at: Minimum created_at timestamp
         max_created_at: Maximum created_at timestamp
     """
+    if not sentiments:
+        return  # No sentiments to save
+
     table = "sentiment"
     # Sanitize the job_id to create a valid table name
     sanitized_job_id = sanitize_for_athena(job_id)
@@ -76,12 +154,13 @@ def save_sentiments(
     database = "sentimental"
     bucket = os.environ["S3_BUCKET_NAME"]
 
-    # Convert list of Sentiment objects to DataFrame for batch processing
-    sentiment_dicts = [sentiment.to_dict() for sentiment in sentiments]
-    if not sentiment_dicts:
-        return  # No sentiments to save
-
-    df_sentiments = pd.DataFrame(sentiment_dicts)
+    # Convert list of Sentiment objects to a column-oriented DataFrame
+    df_sentiments = pd.DataFrame(
+        {
+            column: list(map(_SENTIMENT_COLUMN_GETTERS[column], sentiments))
+            for column in _SENTIMENT_COLUMNS
+        }
+    )
 
     # Write the DataFrame to S3 and create a temp table
     s3_temp_path = f"s3://{bucket}/temp_data/{temp_table}/"
@@ -90,74 +169,58 @@ def save_sentiments(
         path=s3_temp_path,
         dataset=True,
         mode="overwrite",
+        compression="zstd",
+        pyarrow_additional_kwargs={
+            "compression_level": 3,
+            "write_table_args": {"row_group_size": 131_072},
+        },
+        boto3_session=BOTO3_SESSION,
     )
 
-    # Create temp table from the S3 data
-    athena_type_mapping = {
-        "keyword": "STRING",
-        "created_at": "TIMESTAMP",
-        "execution_id": "STRING",
-        "post_id": "STRING",
-        "post_url": "STRING",
-        "sentiment": "STRING",
-        "sentiment_score_mixed": "DOUBLE",
-        "sentiment_score_positive": "DOUBLE",
-        "sentiment_score_neutral": "DOUBLE",
-        "sentiment_score_negative": "DOUBLE",
-    }
-
     # First delete any existing temp table
-    wr.catalog.delete_table_if_exists(database=database, table=temp_table)
+    wr.catalog.delete_table_if_exists(
+        database=database, table=temp_table, boto3_session=BOTO3_SESSION
+    )
 
     # Create the temp table with Parquet format
     wr.catalog.create_parquet_table(
         database=database,
         table=temp_table,
         path=s3_temp_path,
-        columns_types=athena_type_mapping,
+        columns_types=_SENTIMENT_COLUMN_TYPES,
         mode="overwrite",
+        boto3_session=BOTO3_SESSION,
     )
 
     # Perform a MERGE operation using Iceberg's MERGE INTO syntax
+    update_set = ",\n        ".join(f"{c} = s.{c}" for c in _SENTIMENT_COLUMNS)
+    insert_values = ",\n        ".join(f"s.{c}" for c in _SENTIMENT_COLUMNS)
     merge_query = f"""
     MERGE INTO {database}.{table} t
     USING {database}.{temp_table} s
     ON t.post_id = s.post_id 
-    AND t.created_at BETWEEN from_unixtime({min_created_at}) AND from_unixtime({max_created_at})
+    AND t.created_at BETWEEN from_unixtime(?) AND from_unixtime(?)
     WHEN MATCHED
       THEN UPDATE SET
-        keyword = s.keyword,
-        created_at = s.created_at,
-        execution_id = s.execution_id,
-        post_id = s.post_id,
-        post_url = s.post_url,
-        sentiment = s.sentiment,
-        sentiment_score_mixed = s.sentiment_score_mixed,
-        sentiment_score_positive = s.sentiment_score_positive,
-        sentiment_score_neutral = s.sentiment_score_neutral,
-        sentiment_score_negative = s.sentiment_score_negative
+        {update_set}
     WHEN NOT MATCHED
       THEN INSERT VALUES (
-        s.keyword,
-        s.created_at,
-        s.execution_id,
-        s.post_id,
-        s.post_url,
-        s.sentiment,
-        s.sentiment_score_mixed,
-        s.sentiment_score_positive,
-        s.sentiment_score_neutral,
-        s.sentiment_score_negative
+        {insert_values}
       )
     """
+    # Sent as Athena execution parameters so the SQL text is identical across runs
+    merge_params = [str(min_created_at), str(max_created_at)]
     logger = logging.getLogger()
-    logger.info("Merge query: \n%s", merge_query)
+    logger.info("Merge query: \n%s\nParameters: %s", merge_query, merge_params)
     # Execute the merge operation
     response = wr.athena.start_query_execution(
         sql=merge_query,
         database=database,
+        params=merge_params,
+        paramstyle="qmark",
         s3_output=f"s3://{bucket}/athena-results/",
         wait=True,
+        boto3_session=BOTO3_SESSION,
     )
     logger.info("Merge operation response: \n%s", response)
     if response["Status"]["State"] != "SUCCEEDED":
@@ -166,9 +229,11 @@ def save_sentiments(
         )
 
     # Clean up temp table
-    wr.catalog.delete_table_if_exists(database=database, table=temp_table)
+    wr.catalog.delete_table_if_exists(
+        database=database, table=temp_table, boto3_session=BOTO3_SESSION
+    )
 
     # Clean up S3 temp data
-    wr.s3.delete_objects(s3_temp_path)
+    wr.s3.delete_objects(s3_temp_path, boto3_session=BOTO3_SESSION)
 
     return response.get("QueryExecutionId")
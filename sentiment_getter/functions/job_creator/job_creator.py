@@ -4,7 +4,8 @@ Lambda function to create sentiment analysis jobs from batches of posts.
 
 import json
 import logging
-from datetime import datetime
+import time
+import uuid
 
 from functions.athena import get_posts
 from sentiment_service_providers.service_provider_factory import get_service_provider
@@ -33,9 +34,10 @@ def lambda_handler(event, _):
     # Configure logging
     logger = logging.getLogger("job creator")
     logger.setLevel(logging.INFO)
-    logger.debug(
-        "Creating sentiment analysis job with parameters: %s", json.dumps(event)
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Creating sentiment analysis job with parameters: %s", json.dumps(event)
+        )
 
     execution_id = event["ExecutionID"]
 
@@ -47,14 +49,14 @@ def lambda_handler(event, _):
     provider = get_service_provider(logger=logger)
 
     # validate that all posts have the same execution id
-    execution_id = posts[0].execution_id
-    if not all(post.execution_id == execution_id for post in posts):
+    execution_ids = {post.execution_id for post in posts}
+    if len(execution_ids) != 1:
         raise ValueError("All posts must have the same execution id")
+    execution_id = execution_ids.pop()
 
-    # remove posts that have duplicate ids
-    posts = list({post.id: post for post in posts}.values())
-
-    job_name = f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # Random suffix keeps names unique when jobs are created within the same second
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+    job_name = f"job_{timestamp}_{uuid.uuid4().hex[:6]}"
     job = provider.create_sentiment_job(posts, job_name)
 
     return {
@@ -0,0 +1,12 @@
+"""Common functions for scrapers"""
+
+
+def truncate(text: str, limit: int) -> str:
+    """
+    Truncate text to `limit` characters, appending "..." if anything was cut.
+    """
+    # Slice one extra character so a single slice tells us whether text is longer
+    head = text[: limit + 1]
+    if len(head) > limit:
+        return head[:limit] + "..."
+    return text
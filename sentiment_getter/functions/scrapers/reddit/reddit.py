@@ -17,9 +17,10 @@ def lambda_handler(event, _):
     logger = logging.getLogger("reddit scraper")
     logger.setLevel(logging.INFO)
 
-    logger.debug(
-        "Starting Reddit scraper with parameters: %s", json.dumps(event, indent=2)
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Starting Reddit scraper with parameters: %s", json.dumps(event, indent=2)
+        )
 
     # Get posts from Reddit
     posts = get_reddit_posts(
@@ -3,14 +3,27 @@ This module contains the Reddit scrapper.
 It is used to scrape Reddit posts and comments for a given keyword.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import cache
 import os
+import json
 import logging
+from typing import TYPE_CHECKING
+from urllib.parse import quote
+import boto3
+from botocore.exceptions import BotoCoreError, ClientError
 import praw
-from openai import OpenAI
 from praw.models import Subreddit, Submission
+from functions.scrapers.common import truncate
 from models.post import Post
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# ChatGPT subreddit suggestions are stable for a keyword, so reuse them for a day
+SUBREDDIT_CACHE_PREFIX = "cache/subreddits"
+SUBREDDIT_CACHE_TTL = timedelta(days=1)
+
 
 # Initialize Reddit client only when needed
 def get_reddit_client():
@@ -28,6 +41,9 @@ def get_openai_client():
     """Get a configured OpenAI client using environment variables."""
     if not openai_set():
         raise ValueError("OPENAI_API_KEY is not set")
+    # Imported here so invocations with explicit subreddits never load openai
+    from openai import OpenAI  # pylint: disable=import-outside-toplevel
+
     return OpenAI(api_key=os.environ["OPENAI_API_KEY"])
 
 
@@ -37,7 +53,7 @@ def openai_set() -> bool:
 
 
 def get_subreddits_from_chatgpt(
-    openai: OpenAI, keyword: str, logger: logging.Logger | None = None
+    openai: "OpenAI", keyword: str, logger: logging.Logger | None = None
 ) -> list[str]:
     """Get relevant subreddits for a keyword using ChatGPT.
 
@@ -84,6 +100,73 @@ def get_subreddits_from_chatgpt(
     return subreddits
 
 
+@cache
+def get_s3_client():
+    """Get an S3 client, created once and reused across warm invocations."""
+    return boto3.client("s3")
+
+
+def _subreddit_cache_key(keyword: str) -> str:
+    """Build the S3 key holding cached subreddits for a keyword."""
+    return f"{SUBREDDIT_CACHE_PREFIX}/{quote(keyword.lower(), safe='')}.json"
+
+
+def get_cached_subreddits(
+    keyword: str, logger: logging.Logger | None = None
+) -> list[str] | None:
+    """Get previously suggested subreddits for a keyword from S3.
+
+    Returns:
+        list[str] | None: Cached subreddit names, or None if missing or expired
+    """
+    # The cache is an optimization, any failure reading it is treated as a miss
+    bucket = os.environ.get("S3_BUCKET_NAME")
+    if not bucket:
+        return None
+    try:
+        response = get_s3_client().get_object(
+            Bucket=bucket, Key=_subreddit_cache_key(keyword)
+        )
+        if response["LastModified"] < datetime.now(timezone.utc) - SUBREDDIT_CACHE_TTL:
+            return None
+        subreddits = json.loads(response["Body"].read())
+    except ClientError as e:
+        if logger and e.response["Error"]["Code"] != "NoSuchKey":
+            logger.warning("Failed to read subreddit cache for '%s': %s", keyword, e)
+        return None
+    except (BotoCoreError, ValueError) as e:  # ValueError covers corrupt JSON
+        if logger:
+            logger.warning("Failed to read subreddit cache for '%s': %s", keyword, e)
+        return None
+
+    if not isinstance(subreddits, list) or not all(
+        isinstance(s, str) for s in subreddits
+    ):
+        if logger:
+            logger.warning("Ignoring malformed subreddit cache for '%s'", keyword)
+        return None
+    return subreddits
+
+
+def cache_subreddits(
+    keyword: str, subreddits: list[str], logger: logging.Logger | None = None
+):
+    """Store suggested subreddits for a keyword in S3."""
+    bucket = os.environ.get("S3_BUCKET_NAME")
+    if not bucket:
+        return
+    try:
+        get_s3_client().put_object(
+            Bucket=bucket,
+            Key=_subreddit_cache_key(keyword),
+            Body=json.dumps(subreddits),
+            ContentType="application/json",
+        )
+    except (ClientError, BotoCoreError) as e:
+        if logger:
+            logger.warning("Failed to cache subreddits for '%s': %s", keyword, e)
+
+
 def get_reddit_posts(**kwargs) -> list[Post]:
     """Get Reddit posts matching search criteria.
 
@@ -96,6 +179,7 @@ def get_reddit_posts(**kwargs) -> list[Post]:
             time_filter (str): Time window to search ('all', 'day', 'hour', 'month', 'week', 'year')
             post_limit (int): Maximum number of posts to retrieve
             top_comments_limit (int): Number of top comments to get per post
+            logger (logging.Logger, optional): Logger for cache and ChatGPT messages
 
     Returns:
         list[Post]: List of Post objects containing matched posts and their top comments
@@ -107,48 +191,59 @@ def get_reddit_posts(**kwargs) -> list[Post]:
     post_limit = kwargs.get("post_limit", 7)
     top_comments_limit = kwargs.get("top_comments_limit", 3)
     execution_id = kwargs["execution_id"]
+    logger = kwargs.get("logger")
 
     # use chatgpt to suggest subreddits
+    new_suggestion = False
     if not subreddits or len(subreddits) == 0:
         if not openai_set():
             subreddits = ["all"]
         else:
-            subreddits = get_subreddits_from_chatgpt(
-                openai=get_openai_client(), keyword=keyword
-            )
+            subreddits = get_cached_subreddits(keyword, logger)
+            if not subreddits:
+                subreddits = get_subreddits_from_chatgpt(
+                    openai=get_openai_client(), keyword=keyword, logger=logger
+                )
+                new_suggestion = True
     else:
         subreddits = ["all"]
 
     posts = []
+    found_any = False
     reddit = get_reddit_client()
     subreddit: Subreddit = reddit.subreddit("+".join(subreddits))
     for post in subreddit.search(
         query=keyword, sort=sort, time_filter=time_filter, limit=post_limit
     ):
         post: Submission = post
+        found_any = True
+        # num_comments comes with the search listing, so low-comment posts are
+        # dropped before paying a request to fetch their comment tree
+        if post.num_comments < 2:
+            continue
+
         post.comments.replace_more(limit=0)
-        top_comments = map(
-            lambda c: c.body[:480] + "..." if len(c.body) > 480 else c.body,
-            post.comments.list()[:top_comments_limit],
+        top_comments = [
+            truncate(c.body, 480) for c in post.comments.list()[:top_comments_limit]
+        ]
+
+        posts.append(
+            Post(
+                id=post.id,
+                keyword=keyword,
+                source="reddit",
+                title=post.title,
+                created_at=datetime.fromtimestamp(post.created_utc),
+                body=truncate(post.selftext, 960),
+                comments=top_comments,
+                post_url=f"https://reddit.com{post.permalink}",
+                execution_id=execution_id,
+            )
         )
 
-        if post.num_comments >= 2:
-            posts.append(
-                Post(
-                    id=post.id,
-                    keyword=keyword,
-                    source="reddit",
-                    title=post.title,
-                    created_at=datetime.fromtimestamp(post.created_utc),
-                    body=(
-                        post.selftext[:960] + "..."
-                        if len(post.selftext) > 960
-                        else post.selftext
-                    ),
-                    comments=list(top_comments),
-                    post_url=f"https://reddit.com{post.permalink}",
-                    execution_id=execution_id,
-                )
-            )
+    # Only cache a suggestion once a search over it has worked, so an invalid
+    # subreddit from ChatGPT is not reused for every run in the next day
+    if new_suggestion and found_any:
+        cache_subreddits(keyword, subreddits, logger)
 
     return posts
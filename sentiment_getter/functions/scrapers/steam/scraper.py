@@ -5,6 +5,7 @@ Module for scraping Steam reviews.
 import logging
 from datetime import datetime
 import requests
+from functions.scrapers.common import truncate
 from models.post import Post
 
 STEAM_API_URL = "https://store.steampowered.com/api/storesearch"
@@ -102,11 +103,7 @@ def get_steam_reviews(
             keyword=keyword,
             source="steam",
             title=f"Steam Review for {keyword}",
-            body=(
-                review["review"][:960] + "..."
-                if len(review["review"]) > 960
-                else review["review"]
-            ),
+            body=truncate(review["review"], 960),
             created_at=created_at,
             comments=[],  # Steam reviews don't have comments in the same way
             post_url=(
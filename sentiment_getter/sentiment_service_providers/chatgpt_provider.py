@@ -2,6 +2,7 @@
 OpenAI ChatGPT implementation of the sentiment provider.
 """
 
+import io
 import os
 import json
 import uuid
@@ -17,6 +18,39 @@ from sentiment_service_providers.sentiment_service_provider import (
 )
 
 
+SYSTEM_PROMPT = (
+    "You are a sentiment analysis tool. "
+    "Analyze the sentiment of the following text "
+    "and respond a single JSON object with the format: "
+    '{"sentiment": "POSITIVE|NEGATIVE|NEUTRAL|MIXED", '
+    '"scores": {'
+    '"Positive": float, '
+    '"Negative": float, '
+    '"Neutral": float, '
+    '"Mixed": float'
+    "}}"
+    " The scores should sum to 1.0."
+    " Do not include any other text in your response."
+)
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def _build_batch_item(post: Post) -> dict:
+    """Build a batch API request line for a post."""
+    # Include a custom_id to match results later
+    return {
+        "custom_id": post.id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": "gpt-4o-mini",
+            "messages": [SYSTEM_MESSAGE, {"role": "user", "content": post.get_text()}],
+            "temperature": 0.3,
+            "max_tokens": 1000,
+        },
+    }
+
+
 class ChatGPTProvider(SentimentServiceProvider):
     """OpenAI ChatGPT implementation of the sentiment provider."""
 
@@ -29,51 +63,20 @@ class ChatGPTProvider(SentimentServiceProvider):
 
         openai.api_key = os.environ["OPENAI_API_KEY"]
 
-        # Create a temporary file with JSONL format for batch API
-        temp_file_path = f"/tmp/{job_name}.jsonl"
         job_id = str(uuid.uuid4())
 
-        with open(temp_file_path, "w", encoding="utf-8") as f:
-            for post in posts:
-                # Include a custom_id to match results later
-                batch_item = {
-                    "custom_id": post.id,
-                    "method": "POST",
-                    "url": "/v1/chat/completions",
-                    "body": {
-                        "model": "gpt-4o-mini",
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": (
-                                    "You are a sentiment analysis tool. "
-                                    "Analyze the sentiment of the following text "
-                                    "and respond a single JSON object with the format: "
-                                    '{"sentiment": "POSITIVE|NEGATIVE|NEUTRAL|MIXED", '
-                                    '"scores": {'
-                                    '"Positive": float, '
-                                    '"Negative": float, '
-                                    '"Neutral": float, '
-                                    '"Mixed": float'
-                                    "}}"
-                                    " The scores should sum to 1.0."
-                                    " Do not include any other text in your response."
-                                ),
-                            },
-                            {"role": "user", "content": post.get_text()},
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 1000,
-                    },
-                }
-                f.write(json.dumps(batch_item) + "\n")
-
-        with open(temp_file_path, "rb") as file:
-            file_content = file.read()  # Read content once
-            file_response = openai.files.create(
-                file=file_content,
-                purpose="batch",
-            )
+        # Build the JSONL batch input in memory, httpx sizes a BytesIO upload
+        # with seek/tell so it never touches /tmp
+        buffer = io.BytesIO()
+        for post in posts:
+            line = json.dumps(_build_batch_item(post))
+            buffer.write(line.encode("utf-8") + b"\n")
+        buffer.seek(0)
+
+        file_response = openai.files.create(
+            file=(f"{job_name}.jsonl", buffer),
+            purpose="batch",
+        )
 
         batch_response = openai.batches.create(
             input_file_id=file_response.id,
@@ -85,9 +88,6 @@ class ChatGPTProvider(SentimentServiceProvider):
             raise ValueError("Error creating batch job")
 
         batch_id = batch_response.id
-        # Clean up temporary file
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
         return Job(
             job_id=job_id,
@@ -149,50 +149,54 @@ class ChatGPTProvider(SentimentServiceProvider):
             )
             return []
 
-        content = openai.files.content(job.provider_data.output_file_id)
-        self.logger.debug("Content: %s", content.text)
-
         sentiments: list[Sentiment] = []
-        lines = content.text.strip().split("\n")
-
-        for line in lines:
-            self.logger.debug("Processing line: %s", line)
-            openai_result = json.loads(line)
-            if openai_result["response"]["status_code"] != 200:
-                self.logger.warning(
-                    "Unexpected response: %s", openai_result["response"]
+        posts_by_id = {post.id: post for post in posts}
+
+        # Stream the output file line by line instead of loading it into one string
+        with openai.files.with_streaming_response.content(
+            job.provider_data.output_file_id
+        ) as response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                self.logger.debug("Processing line: %s", line)
+                openai_result = json.loads(line)
+                if openai_result["response"]["status_code"] != 200:
+                    self.logger.warning(
+                        "Unexpected response: %s", openai_result["response"]
+                    )
+                    continue
+
+                # Find the corresponding post
+                post = posts_by_id.get(openai_result["custom_id"])
+                if post is None:
+                    self.logger.warning(
+                        "No post found for custom_id: %s", openai_result["custom_id"]
+                    )
+                    continue
+                self.logger.debug("Found matching post: %s", post)
+
+                # Extract sentiment data
+                content = openai_result["response"]["body"]["choices"][0]["message"][
+                    "content"
+                ]
+                # Sometimes the bot will f-up and return a non-json object
+                try:
+                    parsed = json.loads(content)
+                except json.JSONDecodeError:
+                    self.logger.warning("Failed to parse content: %s", content)
+                    continue
+                sentiment = parsed["sentiment"]
+                scores = parsed["scores"]
+                sentiments.append(
+                    Sentiment(
+                        post=post,
+                        sentiment=sentiment,
+                        mixed=scores["Mixed"],
+                        positive=scores["Positive"],
+                        negative=scores["Negative"],
+                        neutral=scores["Neutral"],
+                    )
                 )
-                continue
-
-            post_id = openai_result["custom_id"]
-            if post_id not in [post.id for post in posts]:
-                continue
-
-            # Find the corresponding post
-            post = next(post for post in posts if post.id == post_id)
-            self.logger.debug("Found matching post: %s", post)
-
-            # Extract sentiment data
-            content = openai_result["response"]["body"]["choices"][0]["message"][
-                "content"
-            ]
-            # Sometimes the bot will f-up and return a non-json object
-            try:
-                parsed = json.loads(content)
-            except json.JSONDecodeError:
-                self.logger.warning("Failed to parse content: %s", content)
-                continue
-            sentiment = parsed["sentiment"]
-            scores = parsed["scores"]
-            sentiments.append(
-                Sentiment(
-                    post=post,
-                    sentiment=sentiment,
-                    mixed=scores["Mixed"],
-                    positive=scores["Positive"],
-                    negative=scores["Negative"],
-                    neutral=scores["Neutral"],
-                )
-            )
 
         return sentiments
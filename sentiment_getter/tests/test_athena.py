@@ -0,0 +1,151 @@
+"""Unit tests for Athena helper functions."""
+
+import unittest
+from unittest.mock import patch
+from datetime import datetime
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from functions.athena import (
+    _SENTIMENT_COLUMN_GETTERS,
+    _SENTIMENT_COLUMNS,
+    get_posts,
+    sanitize_for_athena,
+    save_sentiments,
+)
+from models.post import Post
+from models.sentiment import Sentiment
+
+
+class TestAthena(unittest.TestCase):
+    """Unit tests for Athena helper functions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        os.environ["S3_BUCKET_NAME"] = "test-bucket"
+
+    def test_sanitize_for_athena(self):
+        """Test sanitize_for_athena replaces invalid characters."""
+        self.assertEqual(sanitize_for_athena("Job-123.abc"), "job_123_abc")
+        self.assertEqual(sanitize_for_athena("1abc"), "_1abc")
+        self.assertEqual(sanitize_for_athena("jöb id"), "j_b_id")
+
+    @patch("functions.athena.wr.athena.read_sql_query")
+    def test_get_posts(self, mock_read_sql_query):
+        """Test get_posts converts DataFrame rows to Post objects."""
+        mock_read_sql_query.return_value = pd.DataFrame(
+            {
+                "id": ["1", "2"],
+                "execution_id": ["exec-1", "exec-1"],
+                "created_at": [datetime(2024, 1, 1), datetime(2024, 1, 2)],
+                "keyword": ["test", "test"],
+                "source": ["reddit", "steam"],
+                "title": ["Title 1", "Title 2"],
+                "body": ["Body 1", "Body 2"],
+                "comments": [["c1", "c2"], []],
+                "post_url": ["https://example.com/1", "https://example.com/2"],
+            }
+        )
+
+        posts = get_posts("exec-1")
+
+        call_kwargs = mock_read_sql_query.call_args.kwargs
+        self.assertNotIn("exec-1", call_kwargs["sql"])
+        self.assertEqual(call_kwargs["params"], ["'exec-1'"])
+        self.assertEqual(len(posts), 2)
+        for post in posts:
+            self.assertIsInstance(post, Post)
+        self.assertEqual(posts[0].id, "1")
+        self.assertEqual(posts[0].comments, ["c1", "c2"])
+        self.assertEqual(posts[1].source, "steam")
+        self.assertEqual(posts[1].post_url, "https://example.com/2")
+
+    @patch("functions.athena.wr.athena.read_sql_query")
+    def test_get_posts_parquet_arrays(self, mock_read_sql_query):
+        """Test get_posts converts Parquet array columns to plain lists."""
+        mock_read_sql_query.return_value = pa.table(
+            {
+                "id": ["1", "2"],
+                "execution_id": ["exec-1", "exec-1"],
+                "created_at": [datetime(2024, 1, 1), datetime(2024, 1, 2)],
+                "keyword": ["test", "test"],
+                "source": ["reddit", "steam"],
+                "title": ["Title 1", "Title 2"],
+                "body": ["Body 1", "Body 2"],
+                "comments": pa.array([["c1", "c2"], []], type=pa.list_(pa.string())),
+                "post_url": ["https://example.com/1", "https://example.com/2"],
+            }
+        ).to_pandas()
+
+        posts = get_posts("exec-1")
+
+        self.assertEqual(posts[0].comments, ["c1", "c2"])
+        self.assertIsInstance(posts[0].comments, list)
+        self.assertEqual(posts[1].comments, [])
+        self.assertIn("comments: c1 - c2", posts[0].get_text())
+        self.assertIn('"comments": ["c1", "c2"]', posts[0].to_json())
+
+    @patch("functions.athena.wr.athena.read_sql_query")
+    def test_get_posts_empty(self, mock_read_sql_query):
+        """Test get_posts returns an empty list when no rows are found."""
+        mock_read_sql_query.return_value = pd.DataFrame()
+        self.assertEqual(get_posts("exec-1"), [])
+
+    @patch("functions.athena.wr")
+    def test_save_sentiments(self, mock_wr):
+        """Test save_sentiments writes one row per sentiment and merges once."""
+        post = Post(
+            id="1",
+            execution_id="exec-1",
+            keyword="test",
+            source="reddit",
+            title="Title",
+            created_at=datetime(2024, 1, 1),
+            body="Body",
+            comments=[],
+            post_url="https://example.com/1",
+        )
+        sentiment = Sentiment(
+            post=post,
+            sentiment="POSITIVE",
+            mixed=0.1,
+            positive=0.7,
+            negative=0.1,
+            neutral=0.1,
+        )
+        mock_wr.athena.start_query_execution.return_value = {
+            "QueryExecutionId": "query-123",
+            "Status": {"State": "SUCCEEDED"},
+        }
+
+        result = save_sentiments("job-123", [sentiment], 0, 1)
+
+        self.assertEqual(result, "query-123")
+        mock_wr.athena.start_query_execution.assert_called_once()
+        # Every Sentiment field must reach the temp table, in table order
+        self.assertEqual(tuple(sentiment.to_dict()), _SENTIMENT_COLUMNS)
+        self.assertEqual(tuple(_SENTIMENT_COLUMN_GETTERS), _SENTIMENT_COLUMNS)
+        for column, value in sentiment.to_dict().items():
+            self.assertEqual(_SENTIMENT_COLUMN_GETTERS[column](sentiment), value)
+        df = mock_wr.s3.to_parquet.call_args.kwargs["df"]
+        self.assertEqual(tuple(df.columns), _SENTIMENT_COLUMNS)
+        merge_kwargs = mock_wr.athena.start_query_execution.call_args.kwargs
+        merge_sql = merge_kwargs["sql"]
+        self.assertEqual(merge_kwargs["params"], ["0", "1"])
+        self.assertEqual(merge_kwargs["paramstyle"], "qmark")
+        for column in _SENTIMENT_COLUMNS:
+            self.assertIn(f"{column} = s.{column}", merge_sql)
+        self.assertEqual(df.iloc[0]["post_id"], "1")
+        self.assertEqual(df["sentiment_score_positive"].dtype, "float64")
+
+    @patch("functions.athena.wr")
+    def test_save_sentiments_empty(self, mock_wr):
+        """Test save_sentiments does nothing when there are no sentiments."""
+        self.assertIsNone(save_sentiments("job-123", [], 0, 1))
+        mock_wr.s3.to_parquet.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
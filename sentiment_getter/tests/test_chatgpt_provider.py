@@ -1,5 +1,6 @@
 """Unit tests for ChatGPTProvider class."""
 
+import io
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
@@ -44,6 +45,43 @@ class TestChatGPTProvider(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.provider.create_sentiment_job([], "test-job", "123")
 
+    @patch("openai.batches.create")
+    @patch("openai.files.create")
+    def test_create_sentiment_job(self, mock_files_create, mock_batches_create):
+        """Test create_sentiment_job uploads one JSONL line per post."""
+        uploaded = {}
+
+        def files_create(file, purpose):
+            uploaded["name"], content = file
+            uploaded["in_memory"] = isinstance(content, io.BytesIO)
+            uploaded["content"] = content.read()
+            uploaded["purpose"] = purpose
+            return MagicMock(id="file-123")
+
+        mock_files_create.side_effect = files_create
+        mock_batches_create.return_value = MagicMock(id="batch-123", errors=None)
+
+        job = self.provider.create_sentiment_job([self.sample_post], "test-job")
+
+        self.assertEqual(uploaded["name"], "test-job.jsonl")
+        self.assertEqual(uploaded["purpose"], "batch")
+        self.assertTrue(uploaded["in_memory"])
+        lines = uploaded["content"].decode("utf-8").strip().split("\n")
+        self.assertEqual(len(lines), 1)
+        batch_item = json.loads(lines[0])
+        self.assertEqual(batch_item["custom_id"], self.sample_post.id)
+        self.assertEqual(
+            batch_item["body"]["messages"][1]["content"], self.sample_post.get_text()
+        )
+        mock_batches_create.assert_called_once_with(
+            input_file_id="file-123",
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        self.assertEqual(job.status, "SUBMITTED")
+        self.assertEqual(job.post_ids, [self.sample_post.id])
+        self.assertEqual(job.provider_data.openai_batch_id, "batch-123")
+
     @patch("openai.batches.retrieve")
     def test_check_job_status_completed(self, mock_batch_retrieve):
         """Test check_job_status when job is completed."""
@@ -92,8 +130,8 @@ class TestChatGPTProvider(unittest.TestCase):
         self.assertEqual(status, "FAILED")
         self.assertEqual(provider_data.error_file_id, "error-123")
 
-    @patch("openai.files.content")
-    def test_process_completed_job(self, mock_file_content):
+    @patch("openai.files.with_streaming_response")
+    def test_process_completed_job(self, mock_streaming_response):
         """Test process_completed_job with valid output."""
         # Create a job with output file ID
         job = Job(
@@ -108,9 +146,8 @@ class TestChatGPTProvider(unittest.TestCase):
             ),
         )
 
-        # Mock OpenAI file content response
-        mock_content = MagicMock()
-        mock_content.text = json.dumps(
+        # Mock OpenAI streamed file content response
+        result_line = json.dumps(
             {
                 "custom_id": "123",
                 "response": {
@@ -137,10 +174,17 @@ class TestChatGPTProvider(unittest.TestCase):
                 },
             }
         )
-        mock_file_content.return_value = mock_content
+        unmatched_line = result_line.replace('"custom_id": "123"', '"custom_id": "999"')
+        mock_response = MagicMock()
+        mock_response.iter_lines.return_value = iter([result_line, unmatched_line, ""])
+        mock_streaming_response.content.return_value.__enter__.return_value = (
+            mock_response
+        )
 
-        # Process the job
-        sentiments = self.provider.process_completed_job(job, [self.sample_post])
+        # Process the job, results without a matching post are skipped with a warning
+        with self.assertLogs(self.provider.logger, "WARNING") as logs:
+            sentiments = self.provider.process_completed_job(job, [self.sample_post])
+        self.assertIn("No post found for custom_id: 999", logs.output[0])
 
         # Verify results
         self.assertEqual(len(sentiments), 1)
@@ -152,6 +196,7 @@ class TestChatGPTProvider(unittest.TestCase):
         self.assertEqual(sentiment.neutral, 0.1)
         self.assertEqual(sentiment.mixed, 0.1)
         self.assertEqual(sentiment.post.id, self.sample_post.id)
+        mock_streaming_response.content.assert_called_once_with("output-123")
 
     @patch("openai.files.content")
     @patch("boto3.client")
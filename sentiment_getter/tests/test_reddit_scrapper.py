@@ -0,0 +1,215 @@
+"""Unit tests for Reddit scrapper functionality."""
+
+import io
+import os
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError, EndpointConnectionError
+from functions.scrapers.reddit.scrapper import (
+    cache_subreddits,
+    get_cached_subreddits,
+    get_reddit_posts,
+)
+from models.post import Post
+
+
+def make_submission(post_id, num_comments, comments):
+    """Create a mock praw Submission."""
+    submission = MagicMock()
+    submission.id = post_id
+    submission.title = f"Title {post_id}"
+    submission.selftext = "x" * 1000
+    submission.created_utc = 1609459200  # 2021-01-01
+    submission.permalink = f"/r/gaming/comments/{post_id}/"
+    submission.num_comments = num_comments
+    submission.comments.list.return_value = [MagicMock(body=c) for c in comments]
+    return submission
+
+
+class TestRedditScrapper(unittest.TestCase):
+    """Unit tests for Reddit scrapper functionality."""
+
+    @patch("functions.scrapers.reddit.scrapper.get_reddit_client")
+    def test_get_reddit_posts(self, mock_get_reddit_client):
+        """Test that get_reddit_posts returns posts with enough comments."""
+        popular = make_submission("abc", 5, ["first", "second", "third"])
+        quiet = make_submission("def", 1, ["only"])
+        mock_reddit = MagicMock()
+        mock_reddit.subreddit.return_value.search.return_value = [popular, quiet]
+        mock_get_reddit_client.return_value = mock_reddit
+
+        result = get_reddit_posts(
+            subreddits=["gaming"],
+            keyword="Dota 2",
+            top_comments_limit=2,
+            execution_id="123",
+        )
+
+        self.assertEqual(len(result), 1)
+        post = result[0]
+        self.assertIsInstance(post, Post)
+        self.assertEqual(post.id, "abc")
+        self.assertEqual(post.source, "reddit")
+        self.assertEqual(post.comments, ["first", "second"])
+        self.assertEqual(post.body, "x" * 960 + "...")
+        self.assertEqual(post.post_url, "https://reddit.com/r/gaming/comments/abc/")
+
+        # Comments are never fetched for posts that are filtered out
+        quiet.comments.replace_more.assert_not_called()
+        quiet.comments.list.assert_not_called()
+
+
+class TestSubredditCache(unittest.TestCase):
+    """Unit tests for the ChatGPT subreddit suggestion cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        os.environ["S3_BUCKET_NAME"] = "test-bucket"
+        os.environ["OPENAI_API_KEY"] = "test-key"
+
+    def tearDown(self):
+        """Clean up environment variables."""
+        del os.environ["OPENAI_API_KEY"]
+
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_get_cached_subreddits_expired(self, mock_get_s3_client):
+        """Test that stale cache entries are ignored."""
+        mock_get_s3_client.return_value.get_object.return_value = {
+            "LastModified": datetime.now(timezone.utc) - timedelta(days=2),
+            "Body": io.BytesIO(b'["dota2"]'),
+        }
+        self.assertIsNone(get_cached_subreddits("Dota 2"))
+
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_get_cached_subreddits_corrupt(self, mock_get_s3_client):
+        """Test that unreadable or malformed cache entries are treated as a miss."""
+        mock_s3 = mock_get_s3_client.return_value
+        for body in (b"not json", b'{"dota2": 1}', b'["dota2", 3]'):
+            mock_s3.get_object.return_value = {
+                "LastModified": datetime.now(timezone.utc),
+                "Body": io.BytesIO(body),
+            }
+            self.assertIsNone(get_cached_subreddits("Dota 2"))
+
+        mock_s3.get_object.side_effect = EndpointConnectionError(endpoint_url="s3")
+        self.assertIsNone(get_cached_subreddits("Dota 2"))
+
+    @patch("functions.scrapers.reddit.scrapper.get_openai_client")
+    @patch("functions.scrapers.reddit.scrapper.get_subreddits_from_chatgpt")
+    @patch("functions.scrapers.reddit.scrapper.get_reddit_client")
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_corrupt_cache_falls_back_to_chatgpt(
+        self, mock_get_s3_client, mock_get_reddit_client, mock_chatgpt, _
+    ):
+        """Test that a corrupt cache entry and a failed write do not stop scraping."""
+        mock_s3 = mock_get_s3_client.return_value
+        mock_s3.get_object.return_value = {
+            "LastModified": datetime.now(timezone.utc),
+            "Body": io.BytesIO(b"not json"),
+        }
+        mock_s3.put_object.side_effect = EndpointConnectionError(endpoint_url="s3")
+        mock_chatgpt.return_value = ["dota2"]
+        mock_reddit = MagicMock()
+        mock_reddit.subreddit.return_value.search.return_value = [
+            make_submission("abc", 5, ["first"])
+        ]
+        mock_get_reddit_client.return_value = mock_reddit
+
+        result = get_reddit_posts(keyword="Dota 2", execution_id="123")
+
+        mock_chatgpt.assert_called_once()
+        mock_reddit.subreddit.assert_called_once_with("dota2")
+        mock_s3.put_object.assert_called_once()
+        self.assertEqual(len(result), 1)
+
+    @patch("functions.scrapers.reddit.scrapper.get_subreddits_from_chatgpt")
+    @patch("functions.scrapers.reddit.scrapper.get_reddit_client")
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_cache_hit_skips_chatgpt(
+        self, mock_get_s3_client, mock_get_reddit_client, mock_chatgpt
+    ):
+        """Test that cached subreddits are used instead of asking ChatGPT."""
+        mock_s3 = mock_get_s3_client.return_value
+        mock_s3.get_object.return_value = {
+            "LastModified": datetime.now(timezone.utc),
+            "Body": io.BytesIO(b'["dota2", "gaming"]'),
+        }
+        mock_reddit = MagicMock()
+        mock_reddit.subreddit.return_value.search.return_value = []
+        mock_get_reddit_client.return_value = mock_reddit
+
+        get_reddit_posts(keyword="Dota 2", execution_id="123")
+
+        mock_chatgpt.assert_not_called()
+        mock_s3.put_object.assert_not_called()
+        self.assertEqual(
+            mock_s3.get_object.call_args.kwargs["Key"], "cache/subreddits/dota%202.json"
+        )
+        mock_reddit.subreddit.assert_called_once_with("dota2+gaming")
+
+    @patch("functions.scrapers.reddit.scrapper.get_openai_client")
+    @patch("functions.scrapers.reddit.scrapper.get_subreddits_from_chatgpt")
+    @patch("functions.scrapers.reddit.scrapper.get_reddit_client")
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_cache_miss_stores_suggestion(
+        self, mock_get_s3_client, mock_get_reddit_client, mock_chatgpt, _
+    ):
+        """Test that ChatGPT suggestions are cached on a miss."""
+        mock_s3 = mock_get_s3_client.return_value
+        mock_s3.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey"}}, "GetObject"
+        )
+        mock_chatgpt.return_value = ["dota2"]
+        mock_reddit = MagicMock()
+        mock_reddit.subreddit.return_value.search.return_value = [
+            make_submission("abc", 5, ["first"])
+        ]
+        mock_get_reddit_client.return_value = mock_reddit
+
+        get_reddit_posts(keyword="Dota 2", execution_id="123")
+
+        mock_chatgpt.assert_called_once()
+        mock_s3.put_object.assert_called_once()
+        self.assertEqual(mock_s3.put_object.call_args.kwargs["Body"], '["dota2"]')
+
+    @patch("functions.scrapers.reddit.scrapper.get_openai_client")
+    @patch("functions.scrapers.reddit.scrapper.get_subreddits_from_chatgpt")
+    @patch("functions.scrapers.reddit.scrapper.get_reddit_client")
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_failed_search_does_not_cache(
+        self, mock_get_s3_client, mock_get_reddit_client, mock_chatgpt, _
+    ):
+        """Test that suggestions are not cached when searching them fails."""
+        mock_s3 = mock_get_s3_client.return_value
+        mock_s3.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey"}}, "GetObject"
+        )
+        mock_chatgpt.return_value = ["notasubreddit"]
+        mock_reddit = MagicMock()
+        mock_reddit.subreddit.return_value.search.side_effect = RuntimeError("404")
+        mock_get_reddit_client.return_value = mock_reddit
+
+        with self.assertRaises(RuntimeError):
+            get_reddit_posts(keyword="Dota 2", execution_id="123")
+        mock_s3.put_object.assert_not_called()
+
+        # A search that finds nothing is not cached either
+        mock_reddit.subreddit.return_value.search.side_effect = None
+        mock_reddit.subreddit.return_value.search.return_value = []
+        get_reddit_posts(keyword="Dota 2", execution_id="123")
+        mock_s3.put_object.assert_not_called()
+
+    @patch("functions.scrapers.reddit.scrapper.get_s3_client")
+    def test_cache_skipped_without_bucket(self, mock_get_s3_client):
+        """Test that the cache is skipped when S3_BUCKET_NAME is not set."""
+        del os.environ["S3_BUCKET_NAME"]
+
+        self.assertIsNone(get_cached_subreddits("Dota 2"))
+        cache_subreddits("Dota 2", ["dota2"])
+
+        mock_get_s3_client.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()